@@ -1,9 +1,12 @@
+from StringIO import StringIO
 import logging
-from math import sqrt
 import os
+import sys
+import threading
 from unittest.case import TestCase
 
-from zombie_invasion import (Grid, Human, InvalidPositionError, Zombie, ZombieInvasionRunner)
+from zombie_invasion import (Grid, Human, Hunter, InvalidPositionError, Zombie, ZombieInvasionRunner,
+                             ZombieInvasionTerminalRunner, gen_random_vector)
 import random
 
 
@@ -25,25 +28,123 @@ class CharacterTestCase(TestCase):
     def test_human_move_advances_no_more_than_npaces(self):
         pos = (self.grid.X // 2, self.grid.Y // 2)
         newpos = self.human.move(pos)
-        self.assertLessEqual(sqrt((newpos[0] - pos[0])**2 + (newpos[1] - pos[1])**2), self.human.npaces)
+        self.assertLessEqual(max(abs(newpos[0] - pos[0]), abs(newpos[1] - pos[1])), self.human.npaces)
+
+    def test_random_vectors_cover_all_directions(self):
+        vectors = set(gen_random_vector(2) for _ in range(1000))
+        self.assertEqual(vectors, set((dx, dy) for dx in (-2, 0, 2) for dy in (-2, 0, 2)) - {(0, 0)})
 
     def test_zombie_move_reaches_opposite_corner(self):
         pos = (0, 0)
-        self.grid.positions[self.human] = (self.grid.X - 1, self.grid.Y - 1)
+        self.grid.set_position(self.human, (self.grid.X - 1, self.grid.Y - 1))
         self.zombie.npaces = self.grid.X * self.grid.Y
         newpos = self.zombie.move(pos)
         self.assertEqual(newpos, self.grid.positions[self.human])
 
     def test_zombie_move_reaches_random_cell(self):
         pos = (0, 0)
-        self.grid.positions[self.human] = (
+        self.grid.set_position(self.human, (
             random.randint(1, self.grid.X - 1),
             random.randint(1, self.grid.Y - 1),
-        )
+        ))
         self.zombie.npaces = self.grid.X * self.grid.Y
         newpos = self.zombie.move(pos)
         self.assertEqual(newpos, self.grid.positions[self.human])
 
+    def test_zombie_walk_is_limited_to_npaces(self):
+        self.zombie.npaces = 3
+        self.assertEqual(self.zombie._walk_to((0, 0), (5, 2)), (3, 2))
+        self.assertEqual(self.zombie._walk_to((9, 1), (4, 8)), (6, 4))
+
+    def test_zombie_is_placed_on_free_cell(self):
+        for x in range(self.grid.X):
+            for y in range(self.grid.Y):
+                if (x, y) != (7, 3):
+                    self.grid.set_position(Human(self.grid), (x, y))
+        self.assertEqual(Zombie.get_random_positions(self.grid, 1), [(7, 3)])
+        self.grid.set_position(self.zombie, (7, 3))
+        self.assertRaises(InvalidPositionError, Zombie.get_random_positions, self.grid, 1)
+        self.grid.remove(self.zombie)
+        self.assertEqual(Zombie.get_random_positions(self.grid, 1), [(7, 3)])
+
+    def test_zombie_finds_all_nearest_humans(self):
+        other = Human(self.grid)
+        self.grid.set_position(self.human, (2, 5))
+        self.grid.set_position(other, (8, 3))
+        self.grid.set_position(Human(self.grid), (9, 9))
+        self.assertEqual(sorted(self.zombie._find_nearest((5, 5))), [(2, 5), (8, 3)])
+
+    def test_zombie_hunts_nearest_human_in_paces(self):
+        self.grid.set_position(self.human, (3, 3))
+        self.grid.set_position(Human(self.grid), (0, 4))
+        self.assertEqual(self.zombie._find_nearest((0, 0)), [(3, 3)])
+        self.assertEqual(self.zombie.move((0, 0)), (1, 1))
+
+    def test_zombie_switches_to_closer_human(self):
+        self.grid.set_position(self.human, (9, 0))
+        newpos = self.zombie.move((0, 0))
+        self.assertEqual(newpos, (1, 0))
+        self.grid.set_position(Human(self.grid), (1, 3))
+        self.assertEqual(self.zombie.move(newpos), (1, 1))
+
+    def count_searches(self, zombie):
+        find_nearest = zombie._find_nearest
+        calls = []
+
+        def counting_find_nearest(pos):
+            calls.append(pos)
+            return find_nearest(pos)
+
+        zombie._find_nearest = counting_find_nearest
+        return calls
+
+    def test_zombie_keeps_hunting_without_search_while_distant_humans_move(self):
+        calls = self.count_searches(self.zombie)
+        other = Human(self.grid)
+        self.grid.set_position(self.human, (9, 0))
+        self.grid.set_position(other, (30, 30))
+        newpos = self.zombie.move((0, 0))
+        self.grid.set_position(other, (31, 30))
+        self.assertEqual(self.zombie.move(newpos), (2, 0))
+        self.assertIs(self.zombie.last_hunted, self.human)
+        self.assertEqual(calls, [(0, 0)])
+
+    def test_positions_are_adjacent_in_all_directions(self):
+        self.assertTrue(self.grid.is_adjacent((5, 5), (5, 6)))
+        self.assertTrue(self.grid.is_adjacent((5, 5), (4, 5)))
+        self.assertTrue(self.grid.is_adjacent((5, 5), (6, 4)))
+        self.assertFalse(self.grid.is_adjacent((5, 5), (5, 5)))
+        self.assertFalse(self.grid.is_adjacent((5, 5), (5, 7)))
+
+    def test_hunter_shoots_adjacent_zombie(self):
+        hunter = Hunter(self.grid)
+        self.grid.set_position(hunter, (5, 5))
+        self.grid.set_position(self.zombie, (5, 6))
+        hunter.interact(hunter.position)
+        self.assertNotIn(self.zombie, self.grid.positions)
+        self.assertEqual(hunter.slugs_left, hunter.slugs - 1)
+
+    def test_turned_human_is_counted_as_zombie(self):
+        self.grid.set_position(self.human, (5, 5))
+        self.grid.set_position(self.zombie, (5, 5))
+        self.zombie.interact(self.zombie.position)
+        self.assertEqual(self.grid.count_of(Human), 0)
+        self.assertEqual(self.grid.count_of(Zombie), 2)
+        self.assertEqual(self.grid.positions_of(Zombie).tolist(), [[5, 5], [5, 5]])
+
+    def test_hunter_shoots_once_per_turn(self):
+        hunter = Hunter(self.grid)
+        other = Zombie(self.grid)
+        self.grid.set_position(hunter, (5, 5))
+        self.grid.set_position(self.zombie, (4, 4))
+        self.grid.set_position(other, (6, 6))
+        hunter.interact(hunter.position)
+        hunter.interact(hunter.position)
+        self.assertEqual(self.grid.count_of(Zombie), 1)
+        self.grid.turn += 1
+        hunter.interact(hunter.position)
+        self.assertEqual(self.grid.count_of(Zombie), 0)
+
 
 class ZombieInvasionRunnerTestCase(TestCase):
     def setUp(self):
@@ -57,8 +158,62 @@ class ZombieInvasionRunnerTestCase(TestCase):
         self.sim.run()
         self.assertTrue(self.sim.count_of(Human) == 0 or self.sim.count_of(Zombie) == 0)
 
+    def test_simulator_with_parallel_zombies_leaves_proper_characters_count(self):
+        self.sim = ZombieInvasionRunner(config=dict(character_types=(Human, Zombie), parallel_zombies=True))
+        self.sim.run()
+        self.assertEqual(self.sim.count_of(Zombie) + self.sim.count_of(Human), Zombie.initial + Human.initial)
+        self.assertTrue(self.sim.count_of(Human) == 0 or self.sim.count_of(Zombie) == 0)
+
+    def test_simulator_with_parallel_zombies_stops_its_threads(self):
+        threads = threading.active_count()
+        for _ in range(3):
+            ZombieInvasionRunner(config=dict(character_types=(Human, Zombie), parallel_zombies=True)).run()
+        self.assertEqual(threading.active_count(), threads)
+
+    def test_zombies_skip_nearest_search_during_turns(self):
+        self.sim = ZombieInvasionRunner(config=dict(character_types=(Human, Zombie)))
+        find_nearest, move = Zombie._find_nearest, Zombie.move
+        counts = {'searches': 0, 'moves': 0}
+
+        def counting_find_nearest(zombie, pos):
+            counts['searches'] += 1
+            return find_nearest(zombie, pos)
+
+        def counting_move(zombie, pos):
+            counts['moves'] += 1
+            return move(zombie, pos)
+
+        Zombie._find_nearest, Zombie.move = counting_find_nearest, counting_move
+        try:
+            for _ in range(50):
+                self.sim.make_turn()
+        finally:
+            Zombie._find_nearest, Zombie.move = find_nearest, move
+        self.assertLess(counts['searches'], counts['moves'])
+
+    def test_zombies_are_placed_on_distinct_free_cells(self):
+        zombie_cells = self.sim._zombie_cell_index
+        self.assertEqual(len(zombie_cells), Zombie.initial)
+        self.assertFalse(set(zombie_cells) & set(self.sim._cell_index))
+
     def test_simulator_leaves_proper_characters_count(self):
         self.sim = ZombieInvasionRunner(config=dict(character_types=(Human, Zombie)))
         self.sim.run()
         self.assertEqual(filter(None, [self.sim.count_of(Zombie), self.sim.count_of(Human)])[0],
                          Zombie.initial + Human.initial)
+
+
+class ZombieInvasionTerminalRunnerTestCase(TestCase):
+    def setUp(self):
+        self.sim = ZombieInvasionTerminalRunner()
+
+    def test_report_status_renders_whole_grid(self):
+        stdout, sys.stdout = sys.stdout, StringIO()
+        try:
+            self.sim.report_status()
+            frame = sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+        rows = frame.splitlines()[2:]
+        self.assertEqual(len(rows), self.sim.Y)
+        self.assertTrue(all(len(row.split(' ')) == self.sim.X for row in rows))
@@ -1,11 +1,23 @@
 from abc import ABCMeta
+from collections import Mapping
 import logging
+from multiprocessing.pool import ThreadPool
 import random
+import sys
 
-import kdtree
+import numpy as np
 
 log = logging.getLogger(__name__)
 
+CLEAR_SCREEN = '\x1b[H\x1b[J'
+RESET_COLOUR = '\x1b[0m'
+HUMAN_COLOUR = '\x1b[1;32m'
+HUNTER_COLOUR = '\x1b[1;34m'
+ZOMBIE_COLOUR = '\x1b[1;31m'
+
+UNIT_DIRECTIONS = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+'''Unit vectors of the 8 directions a character may move in'''
+
 
 class InvalidPositionError(Exception):
     '''
@@ -17,15 +29,41 @@ def gen_random_vector(length):
     '''
     Generate a random 2-vector in one of cardinal or semi-cardinal directions (N,NE,E,SE,S,SW,W,NW)
 
-    @param length: vector length
+    @param length: vector length in paces
+
+    @return: vector tuple
+    '''
+    dx, dy = UNIT_DIRECTIONS[random.getrandbits(3)]
+    return (dx * length, dy * length)
+
+
+def chebyshev_distance(pos1, pos2):
+    '''
+    Return distance between two positions in paces
+
+    @param pos1: 1st position tuple
+    @param pos2: 2nd position tuple
 
-    @return: vector 
+    @return: Chebyshev distance
     '''
-    vector = [0, 0]
-    vector[0] = random.choice([0, length, -length])
-    # second coordinate may not be null if the first one is null
-    vector[1] = random.choice([0] if vector[0] else [] + [length, -length])
-    return vector
+    return max(abs(pos1[0] - pos2[0]), abs(pos1[1] - pos2[1]))
+
+
+def walk_coordinate(coord, target, npaces):
+    '''
+    Walk a single coordinate towards the target one.
+    Every pace shifts each coordinate by 1 until it matches the target,
+    so diagonal paces count as 1 (Chebyshev distance).
+
+    @param coord: initial coordinate
+    @param target: target coordinate
+    @param npaces: max. number of paces
+
+    @return: new coordinate
+    '''
+    if target > coord:
+        return min(coord + npaces, target)
+    return max(coord - npaces, target)
 
 
 class Character(object):
@@ -40,19 +78,24 @@ class Character(object):
         @param grid: a Grid instance to which the character belongs
         '''
         self.grid = grid
+        self.position = None
+        '''Character position in the grid, maintained by Grid.set_position'''
 
-    @property
-    def position(self):
-        '''Return character position in the grid'''
-        return self.grid.positions[self]
-
-    def get_random_position(self):
+    @classmethod
+    def get_random_positions(cls, grid, count):
         '''
-        Generate a random position on the grid as a tuple of coordinates
+        Generate a number of random positions on the grid at once.
+        Positions are drawn from np.random, so seed it with np.random.seed()
+        rather than random.seed() to reproduce the initial layout.
+
+        @param grid: a Grid instance to generate positions for
+        @param count: number of positions
 
-        @return: coordinates tuple
+        @return: list of coordinate tuples
         '''
-        return (random.randint(0, self.grid.X - 1), random.randint(0, self.grid.Y - 1))
+        xs = np.random.randint(0, grid.X, count)
+        ys = np.random.randint(0, grid.Y, count)
+        return zip(xs.tolist(), ys.tolist())
 
     def validate_position(self, newpos):
         '''
@@ -76,10 +119,10 @@ class Character(object):
         @param cls: character class
         @param grid: a ZombieInvasion instance to which the character belongs
         '''
-        for _ in range(cls.initial):
+        for pos in cls.get_random_positions(grid, cls.initial):
             character = cls(grid)
-            grid.positions[character] = character.get_random_position()
-            log.debug('Placing %s at %s', character.name, grid.positions[character])
+            grid.set_position(character, pos)
+            log.debug('Placing %s at %s', character.name, character.position)
 
     def interact(self, pos):
         '''
@@ -113,7 +156,8 @@ class Human(Character):
         @return: new position
         '''
         vector = gen_random_vector(self.npaces)
-        log.debug('Move vector for %s: %s', self, vector)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('Move vector for %s: %s', self, vector)
         newpos = (pos[0] + vector[0], pos[1] + vector[1])
         return newpos
 
@@ -147,17 +191,20 @@ class Hunter(Human):
             log.debug('Restoring slug count for %s, last shot: %s', self, self.last_shot)
             self.slugs_left = self.slugs
 
-        for character in self.grid.positions.keys():
-            if (
-                self.grid.is_adjacent(character.position, self.position) and
-                isinstance(character, Zombie) and
-                self.slugs_left > 0 and
-                self.last_shot != self.grid.turn
-            ):
-                log.info('Shooting %s at %s', character, character.position)
-                self.slugs_left -= 1
-                self.last_shot = self.grid.turn
-                self.grid.remove(character)
+        if self.slugs_left == 0 or self.last_shot == self.grid.turn:
+            return
+
+        zombie_cells = self.grid._zombie_cell_index
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                zombies = zombie_cells.get((pos[0] + dx, pos[1] + dy))
+                if (dx or dy) and zombies:
+                    character = next(iter(zombies))
+                    log.info('Shooting %s at %s', character, character.position)
+                    self.slugs_left -= 1
+                    self.last_shot = self.grid.turn
+                    self.grid.remove(character)
+                    return
 
 
 class Zombie(Character):
@@ -166,55 +213,62 @@ class Zombie(Character):
     name = 'Zombie'
     npaces = 1
     initial = 3
+    _hunted_gen = None
+    '''Grid.human_move_gen value at the time last_hunted was last confirmed amongst the nearest'''
+    _hunted_from = None
+    '''Zombie position at the time last_hunted was last confirmed amongst the nearest'''
+    _hunted_dist = 0
+    '''Min. distance from `_hunted_from` to any Human (including 0) at that time'''
 
     def __init__(self, *args, **kw):
         super(Zombie, self).__init__(*args, **kw)
         self.last_hunted = None
 
-    def get_random_position(self):
+    @classmethod
+    def get_random_positions(cls, grid, count):
         '''
-        Generate a random position.
+        Generate a number of distinct random positions.
 
          A number of Zombies Z will be randomly placed in the grid (In red)
          but will not occupy a sqaure that is already occupied by a Human or Zombie.
+         Positions are drawn from np.random, see Character.get_random_positions().
 
-         @return: generated position tuple
+        @param grid: a Grid instance to generate positions for
+        @param count: number of positions
+
+        @return: list of coordinate tuples
+
+        @raise InvalidPositionError: when there are less than `count` free cells
         '''
-        while True:  # FIXME: infinite loop
-            pos = (random.randint(0, self.grid.X), random.randint(0, self.grid.Y))
-            if pos not in self.grid.positions.values():
-                return pos
+        free_cells = grid._free_cells
+        if count > len(free_cells):
+            raise InvalidPositionError('only %d free cells left' % len(free_cells))
+        return [free_cells[i] for i in np.random.choice(len(free_cells), count, replace=False)]
 
-    def _find_nearest(self, pos, character_type, max_neighbors):
+    def _find_nearest(self, pos):
         '''
-        Find nearest neighbors to this character
+        Find nearest Humans to this character (measured in paces)
+
+        Distance in paces is the Chebyshev distance since diagonal paces
+        are as long as orthogonal ones, see walk_coordinate().
 
         @param pos: position of original character
-        @param character_type: type of target chracters
-        @param max_neighbors: max. neighbors to consider
-        '''
-        target_positions = self.grid.positions_of(character_type)
-        if not target_positions:
-            log.debug('find nearest: no %s left', character_type)
-            return []
 
-        log.debug('Building a k-d tree of %s neighbors for %s out of %s',
-                  character_type, self, target_positions)
-        tree = kdtree.create(target_positions)
-        node_dist_list = tree.search_knn(pos, max_neighbors)
-        log.debug('Nearest nodes to %s: %s', self, node_dist_list)
-        # rank by distance
-        dist_list = [length[1] for length in node_dist_list
-                     # distance 0 ignored: these will be turned anyway
-                     if length[1] != 0]
-        if not dist_list:
-            log.debug('find nearest: no %s left at dist>0', character_type)
+        @return: list of nearest Human position tuples
+        '''
+        humans = self.grid.human_positions()
+        dist = np.maximum(np.abs(humans[:, 0] - pos[0]), np.abs(humans[:, 1] - pos[1]))
+        debug = log.isEnabledFor(logging.DEBUG)
+        # distance 0 ignored: these will be turned anyway
+        dist_list = dist[dist != 0]
+        if not len(dist_list):
+            if debug:
+                log.debug('find nearest: no %s left at dist>0', Human)
             return []
-        min_dist = min(dist_list)
-        log.debug('Min distance: %d', min_dist)
-        # get those at min_dist
-        nearest = [length[0].data for length in node_dist_list if length[1] == min_dist]
-        log.debug('Nearest: %s', nearest)
+        min_dist = dist_list.min()
+        nearest = [tuple(p) for p in humans[dist == min_dist].tolist()]
+        if debug:
+            log.debug('Nearest to %s at distance %d: %s', self, min_dist, nearest)
         return nearest
 
     def _walk_to(self, pos, target):
@@ -228,17 +282,11 @@ class Zombie(Character):
 
         @return: new position tuple
         '''
-        newpos = list(pos)
-        for _ in range(self.npaces):
-            for dim in range(len(pos)):
-                shift = (target[dim] - newpos[dim]) / (abs(target[dim] - newpos[dim]) or 1)
-                log.debug('shift on dim %d = %d', dim, shift)
-                newpos[dim] = newpos[dim] + shift
-            log.debug('walk to: target=%s current=%s', target, tuple(newpos))
-            if tuple(newpos) == tuple(target):
-                break
-
-        return tuple(newpos)
+        newpos = (walk_coordinate(pos[0], target[0], self.npaces),
+                  walk_coordinate(pos[1], target[1], self.npaces))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('walk to: target=%s current=%s', target, newpos)
+        return newpos
 
     def move(self, pos):
         '''
@@ -253,18 +301,66 @@ class Zombie(Character):
 
         @return: new position
         '''
-        nearest = self._find_nearest(pos, Human,
-                                     # max number of neighbors reached if they are all at the grid edges
-                                     self.grid.X * 2 + self.grid.Y * 2)
+        debug = log.isEnabledFor(logging.DEBUG)
+        if self._keeps_target(pos):
+            if debug:
+                log.debug('%s keeps hunting %s', self, self.last_hunted)
+            return self._walk_to(pos, self.last_hunted.position)
+
+        nearest = self._find_nearest(pos)
         if not nearest:
-            log.debug('No nearest %s found, %s standing still', Human, self)
+            if debug:
+                log.debug('No nearest %s found, %s standing still', Human, self)
+            self._hunted_gen = None
             return pos
-        if self.last_hunted not in nearest:
-            self.last_hunted = random.choice(nearest)
-            log.debug('Last hunted escaped, chosen new one: %s', self.last_hunted)
+        target = self.last_hunted
+        if not isinstance(target, Human) or target.position not in nearest:
+            cells = self.grid._cell_index
+            self.last_hunted = random.choice([human for cell in nearest for human in cells[cell]])
+            if debug:
+                log.debug('Last hunted escaped, chosen new one: %s', self.last_hunted)
 
-        assert self.last_hunted is not None
-        return self._walk_to(pos, self.last_hunted)
+        self._confirm_target(pos, chebyshev_distance(pos, nearest[0]))
+        return self._walk_to(pos, self.last_hunted.position)
+
+    def _confirm_target(self, pos, dist):
+        '''
+        Remember that last_hunted is amongst the nearest Humans at `dist` paces
+
+        @param pos: current position tuple
+        @param dist: distance to the nearest Humans
+        '''
+        self._hunted_gen = self.grid.human_move_gen
+        self._hunted_from = pos
+        # a Human sharing the cell is ignored by the search but may be the nearest one later
+        self._hunted_dist = 0 if pos in self.grid._cell_index else dist
+
+    def _keeps_target(self, pos):
+        '''
+        Check whether last_hunted is still amongst the nearest Humans without searching.
+
+        Humans which have not moved since the target was confirmed are at least
+        `_hunted_dist` paces away from `_hunted_from`, so no closer to `pos` than
+        that minus the paces walked since. Cells Humans have moved into since
+        are checked within the target distance only.
+
+        @param pos: current position tuple
+
+        @return: True if last_hunted may be walked to directly
+        '''
+        target = self.last_hunted
+        if self._hunted_gen is None or not isinstance(target, Human) or target.position is None:
+            return False
+        dist = chebyshev_distance(pos, target.position)
+        if not 0 < dist <= self._hunted_dist - chebyshev_distance(pos, self._hunted_from):
+            return False
+        x, y = pos
+        r = dist - 1
+        entered = self.grid._entered_gen[max(x - r, 0):x + r + 1, max(y - r, 0):y + r + 1]
+        if entered.max() > self._hunted_gen:
+            return False
+        self._confirm_target(pos, dist)
+        return True
 
     def interact(self, pos):
         '''
@@ -276,12 +372,37 @@ class Zombie(Character):
 
         @param pos: current position tuple
         '''
-        for character in self.grid.positions:
-            if (character.position == self.position and
-                    isinstance(character, Human)):
-                log.info('Turning %s into %s at %s', character, self.name, pos)
-                character.__class__ = self.__class__
-                character.last_hunted = None
+        humans = self.grid._cell_index.get(pos)
+        if not humans:
+            return
+        # turning moves Humans out of the cell index, iterate over a copy
+        for character in tuple(humans):
+            log.info('Turning %s into %s at %s', character, self.name, pos)
+            self.grid.reclass(character, self.__class__)
+            character.last_hunted = None
+
+
+class PositionsView(Mapping):
+    '''
+    Read-only mapping of the characters on a grid to their position tuples
+    '''
+
+    def __init__(self, grid):
+        self._grid = grid
+
+    def __getitem__(self, character):
+        if character not in self._grid._row:
+            raise KeyError(character)
+        return character.position
+
+    def __contains__(self, character):
+        return character in self._grid._row
+
+    def __iter__(self):
+        return iter(self._grid._row)
+
+    def __len__(self):
+        return len(self._grid._row)
 
 
 class Grid(object):
@@ -293,15 +414,50 @@ class Grid(object):
     '''Grid X size'''
     Y = 40
     '''Grid Y size'''
+    parallel_zombies = False
+    '''
+    Compute Zombie moves in a thread pool.
+    Not a general speed-up: on the default grid thread dispatch costs more
+    than it saves, it only helps with large Zombie counts.
+    '''
+    zombie_workers = None
+    '''Zombie moves thread pool size, defaults to the number of CPUs'''
 
     def __init__(self):
-        self.positions = {}
+        self.positions = PositionsView(self)
         '''
-        A dict mapping characters to coordinate tuples.
+        A read-only mapping of characters to coordinate tuples.
         Coordinates start at upper left (NW) corner and are zero-based.
         '''
+        self.by_type = {}
+        '''A dict mapping character classes to sets of their characters'''
+        self._cell_index = {}
+        '''A dict mapping coordinate tuples to sets of Humans occupying the cell'''
+        self._zombie_cell_index = {}
+        '''A dict mapping coordinate tuples to sets of Zombies occupying the cell'''
+        self._xy = np.zeros((16, 2), dtype=np.int16)
+        '''Character positions array, one row per character'''
+        self._row = {}
+        '''A dict mapping characters to their `_xy` rows'''
+        self._free = list(range(len(self._xy)))
+        '''Unused `_xy` rows'''
+        self._masks = {}
+        '''A dict mapping character classes to boolean arrays of `_xy` rows in use by them'''
+        self._free_cells = [(x, y) for x in range(self.X) for y in range(self.Y)]
+        '''Coordinate tuples of the cells not occupied by any character'''
+        self._free_cell_idx = dict((cell, i) for i, cell in enumerate(self._free_cells))
+        '''A dict mapping free cells to their `_free_cells` indexes'''
         self.turn = 0
         '''Number of turns since simulator start'''
+        self.human_move_gen = 0
+        '''Counter bumped whenever a Human is placed, moved or removed'''
+        self._entered_gen = np.zeros((self.X, self.Y), dtype=np.int64)
+        '''`human_move_gen` value at the time a Human last entered each cell, indexed by [x, y]'''
+        self._human_xy = None
+        '''Cached Human positions array, valid while `human_move_gen` equals `_human_xy_gen`'''
+        self._human_xy_gen = None
+        self._zombie_pool = None
+        '''Thread pool for Zombie moves, created on first use'''
 
     def populate_positions(self):
         '''
@@ -311,28 +467,185 @@ class Grid(object):
             log.debug('Placing %s characters in initial positions', character_type.name)
             character_type.populate(self)
 
-    def move_characters(self):
-        '''Request all characters to adjust positions'''
-        for character in self.positions:
-            pos = self.positions[character]
-            newpos = character.move(pos)
+    def move_characters(self, characters=None):
+        '''
+        Request all characters to adjust positions
+
+        @param characters: (optional) snapshot of characters to move, characters
+            removed from the grid since it was taken are skipped
+        '''
+        set_position = self.set_position
+        debug = log.isEnabledFor(logging.DEBUG)
+        for character, newpos in self._character_moves(characters or tuple(self.positions)):
             try:
                 character.validate_position(newpos)
             except InvalidPositionError:
-                log.debug('Forfeiting %s move due to out of grid position: %s', character, newpos)
-            else:
+                if debug:
+                    log.debug('Forfeiting %s move due to out of grid position: %s', character, newpos)
+                continue
+            if debug:
                 log.debug('New position for %s is %s', character, newpos)
-                self.positions[character] = newpos
+            set_position(character, newpos)
+
+    def _character_moves(self, characters):
+        '''
+        Generate new positions for characters still on the grid.
+
+        Moves are computed lazily, so each character sees the positions
+        of those moved before it. With `parallel_zombies` set Zombies are
+        held back and then moved at once in a thread pool against the
+        same Human positions snapshot.
+
+        @param characters: characters to move
+
+        @return: iterator of (character, new position tuple) pairs
+        '''
+        zombies = []
+        for character in characters:
+            pos = character.position
+            if pos is None:
+                continue
+            if self.parallel_zombies and isinstance(character, Zombie):
+                zombies.append(character)
+            else:
+                yield character, character.move(pos)
+
+        if zombies:
+            # build the snapshot before the workers race to do it
+            self.human_positions()
+            if self._zombie_pool is None:
+                self._zombie_pool = ThreadPool(self.zombie_workers)
+            newpositions = self._zombie_pool.map(lambda zombie: zombie.move(zombie.position), zombies)
+            for move in zip(zombies, newpositions):
+                yield move
+
+    def close(self):
+        '''
+        Shut down the Zombie moves thread pool if one was started
+        '''
+        if self._zombie_pool is not None:
+            self._zombie_pool.close()
+            self._zombie_pool.join()
+            self._zombie_pool = None
+
+    def human_positions(self):
+        '''
+        Return positions of all Humans, cached until a Human is placed, moved or removed
+
+        @return: array of positions, one row per Human
+        '''
+        if self._human_xy_gen != self.human_move_gen:
+            self._human_xy = self.positions_of(Human)
+            self._human_xy_gen = self.human_move_gen
+        return self._human_xy
+
+    def set_position(self, character, pos):
+        '''
+        Place character at a new position keeping the grid indexes in sync
+
+        @param character: character to place
+        @param pos: new position tuple
+        '''
+        oldpos = character.position
+        character.position = pos
+        row = self._row.get(character)
+        if row is None:
+            row = self._add_row(character)
+        self._xy[row] = pos
+        cells = self._cells_of(character)
+        self._unindex(cells, character, oldpos)
+        cells.setdefault(pos, set()).add(character)
+        self._occupy_cell(pos)
+        if isinstance(character, Human) and pos != oldpos:
+            self.human_move_gen += 1
+            self._entered_gen[pos] = self.human_move_gen
+
+    def _add_row(self, character):
+        '''
+        Allocate an `_xy` row for a character placed on the grid
+
+        @param character: character to allocate the row for
+
+        @return: row index
+        '''
+        if not self._free:
+            capacity = len(self._xy)
+            self._xy = np.concatenate((self._xy, np.zeros_like(self._xy)))
+            for cls in self._masks:
+                self._masks[cls] = np.concatenate((self._masks[cls], np.zeros_like(self._masks[cls])))
+            self._free = list(range(capacity, len(self._xy)))
+        row = self._free.pop()
+        self._row[character] = row
+        cls = type(character)
+        if cls not in self._masks:
+            self._masks[cls] = np.zeros(len(self._xy), dtype=bool)
+        self._masks[cls][row] = True
+        self.by_type.setdefault(cls, set()).add(character)
+        return row
+
+    def _occupy_cell(self, pos):
+        '''
+        Take the cell off the free cells list moving the last free cell into its place
+
+        @param pos: coordinate tuple of the cell
+        '''
+        i = self._free_cell_idx.pop(pos, None)
+        if i is None:
+            return
+        last = self._free_cells.pop()
+        if last != pos:
+            self._free_cells[i] = last
+            self._free_cell_idx[last] = i
+
+    def _release_cell(self, pos):
+        '''
+        Put the cell back on the free cells list unless some character still occupies it
+
+        @param pos: coordinate tuple of the cell
+        '''
+        if pos in self._cell_index or pos in self._zombie_cell_index or pos in self._free_cell_idx:
+            return
+        self._free_cell_idx[pos] = len(self._free_cells)
+        self._free_cells.append(pos)
+
+    def _cells_of(self, character):
+        '''
+        Return the cell index for the character type
+
+        @param character: indexed character
+
+        @return: Zombie or Human cell index dict
+        '''
+        return self._zombie_cell_index if isinstance(character, Zombie) else self._cell_index
+
+    def _unindex(self, cells, character, pos):
+        '''
+        Drop character from a cell index
+
+        @param cells: cell index dict
+        @param character: character to drop
+        @param pos: position tuple the character is indexed at
+        '''
+        cell = cells.get(pos)
+        if cell is not None:
+            cell.discard(character)
+            if not cell:
+                del cells[pos]
+                self._release_cell(pos)
 
     def positions_of(self, character_type):
         '''
-        Return positions list of certain type of characters
+        Return positions of certain type of characters
 
         @param character_type: character class
 
-        @return: list of position tuples
+        @return: array of positions, one row per character
         '''
-        return [self.positions[c] for c in self.positions if isinstance(c, character_type)]
+        mask = np.zeros(len(self._xy), dtype=bool)
+        for cls, cls_mask in self._masks.iteritems():
+            if issubclass(cls, character_type):
+                mask |= cls_mask
+        return self._xy[mask]
 
     def count_of(self, character_type):
         '''
@@ -342,7 +655,8 @@ class Grid(object):
 
         @return: number of characters left
         '''
-        return len(set([c for c in self.positions if isinstance(c, character_type)]))
+        return sum(len(characters) for cls, characters in self.by_type.iteritems()
+                   if issubclass(cls, character_type))
 
     def remove(self, character):
         '''
@@ -351,9 +665,29 @@ class Grid(object):
         @param character: character to remove
         '''
         try:
-            del self.positions[character]
+            row = self._row.pop(character)
         except KeyError:
-            pass
+            return
+        self._masks[type(character)][row] = False
+        self._free.append(row)
+        self.by_type[type(character)].discard(character)
+        if isinstance(character, Human):
+            self.human_move_gen += 1
+        self._unindex(self._cells_of(character), character, character.position)
+        character.position = None
+
+    def reclass(self, character, character_type):
+        '''
+        Turn character into another type keeping the grid indexes in sync
+
+        @param character: character to turn
+        @param character_type: new character class
+        '''
+        pos = character.position
+        self.remove(character)
+        character.__class__ = character_type
+        if pos is not None:
+            self.set_position(character, pos)
 
     def is_adjacent(self, pos1, pos2):
         '''
@@ -363,7 +697,9 @@ class Grid(object):
 
         @return: True if positions are ajacent, False otherwise
         '''
-        return (abs(pos1[0] - pos2[0]) == 1) and (abs(pos1[1] - pos2[1]) == 1)
+        dx = pos1[0] - pos2[0]
+        dy = pos1[1] - pos2[1]
+        return -1 <= dx <= 1 and -1 <= dy <= 1 and (dx | dy) != 0
 
 
 class ZombieInvasion(Grid):
@@ -387,14 +723,16 @@ class ZombieInvasion(Grid):
         super(ZombieInvasion, self).__init__()
         self.populate_positions()
 
-    def process_character_interactions(self):
+    def process_character_interactions(self, characters=None):
         '''
         Perform state changes based on current positions
+
+        @param characters: (optional) snapshot of characters to process, characters
+            removed from the grid since it was taken are skipped
         '''
-        for character in self.positions.keys():
-            try:
-                pos = self.positions[character]
-            except KeyError:
+        for character in characters or tuple(self.positions):
+            pos = character.position
+            if pos is None:
                 continue
             character.interact(pos)
 
@@ -403,8 +741,9 @@ class ZombieInvasion(Grid):
         Advance the simulator state by a single turn
         '''
         log.debug('Making turn %d', self.turn)
-        self.process_character_interactions()
-        self.move_characters()
+        characters = tuple(self.positions)
+        self.process_character_interactions(characters)
+        self.move_characters(characters)
         self.turn += 1
 
 
@@ -417,48 +756,62 @@ class ZombieInvasionRunner(ZombieInvasion):
         '''
         Report simulator status
         '''
-        log.debug('Turn: %d Humans: %d Zombies: %d', self.turn,
-                  self.count_of(Human), self.count_of(Zombie))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('Turn: %d Humans: %d Zombies: %d', self.turn,
+                      self.count_of(Human), self.count_of(Zombie))
 
     def run(self):
         '''
         Run make_turn() repeatedly until no Humans left
         and report the number of steps it took to finish
         '''
-        while self.count_of(Human) > 0 and self.count_of(Zombie):
-            self.make_turn()
-            self.report_status()
+        try:
+            while self.count_of(Human) > 0 and self.count_of(Zombie):
+                self.make_turn()
+                self.report_status()
+        finally:
+            self.close()
         log.info('Completed in %d turns', self.turn)
 
 
+TYPE_BITS = {Human: 1, Hunter: 2, Zombie: 4}
+'''Terminal renderer category bits keyed by exact character class'''
+
+
 class ZombieInvasionTerminalRunner(ZombieInvasionRunner):
     def report_status(self):
-        print "\033[H\033[J"
-        print 'Zombie Invasion Simulator :: ',
-        print 'Turn:', self.turn,
-        print "\x1b[1;32mHumans: %02d\x1b[0m" % self.count_of(Human),
-        print "\x1b[1;34mHunters: %02d\x1b[0m" % self.count_of(Hunter),
-        print "\x1b[1;31mZombies: %02d\x1b[0m" % self.count_of(Zombie),
-        print
-
-        revpos = {}
+        '''
+        Render the grid to the terminal as a single frame
+        '''
+        frame = [
+            CLEAR_SCREEN, '\n',
+            'Zombie Invasion Simulator :: Turn: %d ' % self.turn,
+            '%sHumans: %02d%s ' % (HUMAN_COLOUR, self.count_of(Human), RESET_COLOUR),
+            '%sHunters: %02d%s ' % (HUNTER_COLOUR, self.count_of(Hunter), RESET_COLOUR),
+            '%sZombies: %02d%s\n' % (ZOMBIE_COLOUR, self.count_of(Zombie), RESET_COLOUR),
+        ]
+
+        # cell -> (characters count, mask of TYPE_BITS present)
+        cells = {}
         for k, v in self.positions.iteritems():
-            revpos.setdefault(v, []).append(k)
-
-        for y in range(self.Y):
-            for x in range(self.X):
-                characters = revpos.get((x, y), None)
-                if not characters:
-                    print '00',
-                elif any([isinstance(c, Zombie) for c in revpos[(x, y)]]):
-                    print "\x1b[1;31m%02d\x1b[0m" % len(characters),
-                elif any([isinstance(c, Hunter) for c in revpos[(x, y)]]):
-                    print "\x1b[1;34m%02d\x1b[0m" % len(characters),
-                elif all([isinstance(c, Human) for c in revpos[(x, y)]]):
-                    print "\x1b[1;32m%02d\x1b[0m" % len(characters),
-                else:
-                    print '??',
-            print
+            count, mask = cells.get(v, (0, 0))
+            cells[v] = (count + 1, mask | TYPE_BITS.get(type(k), 0))
+
+        rows = [['00'] * self.X for _ in range(self.Y)]
+        for (x, y), (count, mask) in cells.iteritems():
+            if mask & TYPE_BITS[Zombie]:
+                colour = ZOMBIE_COLOUR
+            elif mask & TYPE_BITS[Hunter]:
+                colour = HUNTER_COLOUR
+            elif mask == TYPE_BITS[Human]:
+                colour = HUMAN_COLOUR
+            else:
+                rows[y][x] = '??'
+                continue
+            rows[y][x] = '%s%02d%s' % (colour, count, RESET_COLOUR)
+
+        frame.extend(' '.join(row) + '\n' for row in rows)
+        sys.stdout.write(''.join(frame))
 
 
 if __name__ == '__main__':